@@ -0,0 +1,25 @@
+"""
+Regression checks for xml_editor.py. Run with: python -m unittest
+"""
+
+import json
+import unittest
+
+from xml_editor import xml_to_json
+
+
+class XmlToJsonTest(unittest.TestCase):
+
+    def test_str_input_ignores_declared_encoding(self):
+        # A str is already decoded, so the declared encoding must not be
+        # applied to it a second time.
+        xml = '<?xml version="1.0" encoding="ISO-8859-1"?><a>é</a>'
+        self.assertEqual(json.loads(xml_to_json(xml)), {'a': {'text': 'é'}})
+
+    def test_bytes_input_uses_declared_encoding(self):
+        xml = '<?xml version="1.0" encoding="ISO-8859-1"?><a>é</a>'.encode('latin-1')
+        self.assertEqual(json.loads(xml_to_json(xml)), {'a': {'text': 'é'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
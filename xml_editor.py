@@ -10,183 +10,438 @@ JSON conversion, compression/decompression, and social-network analysis.
 
 import sys
 import os
+import argparse
+import functools
+import hashlib
+import io
+import json
+import mmap
+import pickle
+import queue
 import re
+from collections import OrderedDict, defaultdict
+from html import unescape
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 
-# 3rd-party libraries for visualizing the network
-import networkx as nx
-import matplotlib.pyplot as plt
+# networkx and matplotlib (3rd-party, for visualizing the network) are
+# imported inside the functions that draw, since importing them takes longer
+# than starting everything else; commands that don't draw never load them.
 
-from data_structures import DynamicArray, SinglyLinkedList, Stack, BytePairEncoder
+# lxml parses XML with libxml2 in C and keeps the ElementTree API.
+# Fall back to the standard library parser when it isn't installed.
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+# libxml2 refuses documents nested deeper than 256 levels or with text
+# nodes over 10 MB unless huge_tree is set; large exports can hit both.
+_HUGE_TREE = {'huge_tree': True} if HAVE_LXML else {}
+
+# orjson encodes and decodes JSON in compiled code, several times faster than
+# the json module on large documents. Fall back to json when it isn't installed.
+try:
+    import orjson
+    HAVE_ORJSON = True
+except ImportError:
+    HAVE_ORJSON = False
+
+from data_structures import DynamicArray, SinglyLinkedList, BytePairEncoder
 
 
 ###############################################################################
 # 1) XML Verification Using a Stack
 ###############################################################################
 
-def verify_xml_structure(xml_str, auto_fix=False):
+def _scan_tags(xml_str):
     """
-    Checks for matching opening and closing tags using our custom Stack.
-    Returns (is_consistent, possibly_fixed_string, message).
-    If auto_fix=True, tries to fix simpler errors like unclosed tags
-    by appending missing closing tags (very naive approach).
+    Walk the document once with str.find and yield (kind, name) for every tag.
+    kind is 'open', 'close' or 'self' (self-closing). Declarations, comments
+    and processing instructions (<?...?>, <!...>) are skipped since they
+    never need a closing tag.
     """
-    # We'll look for <tag> and </tag> through a regex, then push/pop from a Stack.
-    tags = re.findall(r"<(/?[^>]+)>", xml_str)
-    stack = Stack()
-    errors = []
+    pos = 0
+    find = xml_str.find
+    while True:
+        lt = find('<', pos)
+        if lt == -1:
+            return
+        gt = find('>', lt + 1)
+        if gt == -1:
+            return  # no '>' left, so no more complete tags either
+        if gt == lt + 1:
+            pos = lt + 1  # "<>" is not a tag
+            continue
+        pos = gt + 1
+        first = xml_str[lt + 1]
+        if first == '/':
+            yield ('close', xml_str[lt + 2:gt].strip())
+        elif first == '?' or first == '!':
+            continue
+        else:
+            # The tag name ends at the first whitespace (attributes follow).
+            parts = xml_str[lt + 1:gt].split(None, 1)
+            name = parts[0] if parts else ''
+            if xml_str[gt - 1] == '/':
+                yield ('self', name.rstrip('/'))
+            else:
+                yield ('open', name)
 
-    # We split the XML into tokens (text or tags) so we can try to fix the content if needed.
-    split_pattern = r'(<[^>]+>)'
-    tokens = re.split(split_pattern, xml_str)
 
-    for t in tags:
-        if t.startswith("/"):
-            # This is a closing tag, e.g. </title>
-            closing_tag_name = t[1:].strip()
-            if stack.is_empty():
-                errors.append(f"Unexpected closing tag </{closing_tag_name}> encountered.")
+def _scan_tags_stream(fin, buf=1 << 20):
+    """
+    _scan_tags over the file object fin, read buf characters at a time.
+    Each chunk is scanned up to its last '>', which always ends a complete
+    tag; the rest, from its first '<' on, is carried into the next chunk.
+    The carry is kept as a list of pieces and joined once a '>' arrives, so
+    a long stretch without one is not copied again for every chunk.
+    """
+    carry = []
+    while True:
+        chunk = fin.read(buf)
+        if not chunk:
+            return  # the carry holds no '>', so no complete tag is left
+        gt = chunk.rfind('>')
+        if gt == -1:
+            if carry:
+                carry.append(chunk)
             else:
-                top_tag = stack.pop()
-                if top_tag != closing_tag_name:
-                    errors.append(f"Mismatched tags: <{top_tag}> closed by </{closing_tag_name}>.")
-        else:
-            # This is an opening tag, e.g. <title>
-            # We separate out the tag name from potential attributes
-            open_name = t.split()[0]
-            # If it's a self-closing tag like <tag .../>, remove the slash at the end.
-            if open_name.endswith("/"):
-                open_name = open_name[:-1].strip()
-            stack.push(open_name.strip())
+                lt = chunk.find('<')
+                if lt != -1:
+                    carry.append(chunk[lt:])
+            continue
+        carry.append(chunk[:gt + 1])
+        yield from _scan_tags(''.join(carry))
+        lt = chunk.find('<', gt + 1)
+        carry = [chunk[lt:]] if lt != -1 else []
 
-    # If any tags remain on the stack, they're unclosed.
-    while not stack.is_empty():
-        unclosed_tag = stack.pop()
-        errors.append(f"Unclosed tag <{unclosed_tag}>.")
+
+def verify_xml_structure(xml_str, auto_fix=False):
+    """
+    Checks for matching opening and closing tags using a stack.
+    Returns (is_consistent, possibly_fixed_string, message).
+    If auto_fix=True, tries to fix simpler errors like unclosed tags
+    by appending missing closing tags (very naive approach).
+    """
+    errors = _check_tags(_scan_tags(xml_str))
 
     if errors:
+        messages = "\n".join(_error_message(err) for err in errors)
         if auto_fix:
-            fixed_content = _naive_xml_autofix(tokens, errors)
+            fixed_content = _naive_xml_autofix(xml_str, errors)
             if fixed_content:
                 return (True, fixed_content, "XML had inconsistencies but some were auto-fixed.")
             else:
-                return (False, xml_str, "Could not fix all XML issues:\n" + "\n".join(errors))
+                return (False, xml_str, "Could not fix all XML issues:\n" + messages)
         else:
-            return (False, xml_str, "XML is invalid:\n" + "\n".join(errors))
+            return (False, xml_str, "XML is invalid:\n" + messages)
     else:
         return (True, xml_str, "XML is well-formed.")
 
 
-def _naive_xml_autofix(tokens, errors):
+def verify_stream(fin):
+    """
+    Like verify_xml_structure without auto_fix, but reads the document from
+    the file object fin in chunks, so only the open tags and the errors are
+    held in memory. Returns (is_consistent, message).
+    """
+    errors = _check_tags(_scan_tags_stream(fin))
+    if errors:
+        return (False, "XML is invalid:\n" + "\n".join(_error_message(err) for err in errors))
+    return (True, "XML is well-formed.")
+
+
+def _check_tags(tags):
+    """
+    Match the (kind, name) tags from _scan_tags and return the list of errors.
+    """
+    # We push/pop the tags on a plain list: append and pop are single C
+    # calls, with no wrapper method in between. Errors are recorded as
+    # (kind, tag names...) tuples, so the fixer can use them directly; they
+    # are only turned into sentences for the message.
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    errors = []
+
+    for kind, name in tags:
+        if kind == 'close':
+            # This is a closing tag, e.g. </title>
+            if not stack:
+                errors.append(('unexpected', name))
+            else:
+                top_tag = pop()
+                if top_tag != name:
+                    errors.append(('mismatch', top_tag, name))
+        elif kind == 'open':
+            # This is an opening tag, e.g. <title>
+            push(name)
+        # Self-closing tags like <tag .../> open and close themselves.
+
+    # If any tags remain on the stack, they're unclosed.
+    while stack:
+        errors.append(('unclosed', pop()))
+    return errors
+
+
+def _error_message(err):
+    # Describe one (kind, tag names...) error from verify_xml_structure.
+    kind = err[0]
+    if kind == 'unexpected':
+        return f"Unexpected closing tag </{err[1]}> encountered."
+    if kind == 'mismatch':
+        return f"Mismatched tags: <{err[1]}> closed by </{err[2]}>."
+    return f"Unclosed tag <{err[1]}>."
+
+
+def _naive_xml_autofix(xml_str, errors):
     """
     A very limited approach to repairing some XML mistakes.
-    For example, if there's an 'Unclosed tag <X>', we might add '</X>' near the end.
-    """
-    new_tokens = []
-    to_append = []
-
-    for err in errors:
-        if err.startswith("Unclosed tag <"):
-            # We'll read the tag name from the message
-            tag_name = err.split("<")[1].split(">")[0]
-            # We'll plan to append a closing tag at the end of the document
-            to_append.append(f"</{tag_name}>")
-        elif "Unexpected closing tag </" in err:
-            # We might want to remove that closing tag from the tokens
-            pass
-        elif "Mismatched tags:" in err:
-            # This is trickier to fix automatically; we skip it in this simplistic approach
-            pass
-
-    # Just recombine everything for now
-    new_xml = "".join(tokens)
-    for closing in to_append:
-        new_xml += closing
-    return new_xml
+    For every ('unclosed', X) error we append '</X>' at the end of the document.
+    Unexpected closing tags and mismatched tags are trickier to fix
+    automatically, so this simplistic approach skips them.
+    """
+    return xml_str + "".join(f"</{err[1]}>" for err in errors if err[0] == 'unclosed')
 
 
 ###############################################################################
 # 2) Formatting (Prettifying) XML
 ###############################################################################
 
+# Indentation per depth, encoded once and reused; grown on demand by _indent.
+_INDENTS = [b"  " * depth for depth in range(64)]
+
+
+def _indent(level):
+    # A negative depth (more closing than opening tags) gets no indentation.
+    if level <= 0:
+        return b""
+    while level >= len(_INDENTS):
+        _INDENTS.append(b"  " * len(_INDENTS))
+    return _INDENTS[level]
+
+
+def _iter_tokens(xml_str):
+    """
+    Yield the text and tag pieces of xml_str in document order, the same
+    pieces re.split(r'(<[^>]+>)', xml_str) would return, without building a list.
+    """
+    find = xml_str.find
+    start = 0  # where the pending text piece begins
+    pos = 0
+    while True:
+        lt = find('<', pos)
+        if lt == -1:
+            break
+        gt = find('>', lt + 1)
+        if gt == -1:
+            break
+        if gt == lt + 1:
+            pos = lt + 1  # "<>" is not a tag, keep it as text
+            continue
+        if lt > start:
+            yield xml_str[start:lt]
+        yield xml_str[lt:gt + 1]
+        start = pos = gt + 1
+    if start < len(xml_str):
+        yield xml_str[start:]
+
+
 def format_xml(xml_str):
     """
     Insert indentation and line breaks to make the XML more readable.
     This is a basic approach that doesn't handle all edge cases.
+    The document is scanned once and the output is written straight into a
+    bytearray, using the cached indentation for each depth.
     """
-    tokens = re.split(r'(<[^>]+>)', xml_str)
-    result = []
+    out = bytearray()
     indent_level = 0
-    indent_spaces = "  "
 
-    for token in tokens:
-        if not token.strip():
+    for token in _iter_tokens(xml_str):
+        stripped = token.strip()
+        if not stripped:
             continue
         if token.startswith("<"):
             # Closing tag?
             if token.startswith("</"):
                 indent_level -= 1
-                result.append(indent_spaces * indent_level + token)
+                out += _indent(indent_level)
+                out += token.encode()
             else:
                 # Opening or self-closing tag
-                result.append(indent_spaces * indent_level + token)
+                out += _indent(indent_level)
+                out += token.encode()
                 if not token.endswith("/>"):
                     indent_level += 1
+            out += b"\n"
         else:
             # Actual text content
-            lines = token.strip().splitlines()
+            if stripped.isprintable():
+                # Common case: a single line. isprintable() is False for every
+                # character splitlines() breaks on, so there is nothing to split.
+                out += _indent(indent_level)
+                out += stripped.encode()
+                out += b"\n"
+                continue
+            lines = stripped.splitlines()
             for line in lines:
                 if line.strip():
-                    result.append(indent_spaces * indent_level + line.strip())
+                    out += _indent(indent_level)
+                    out += line.strip().encode()
+                    out += b"\n"
 
-    return "\n".join(result)
+    if out:
+        del out[-1]  # no newline after the last line
+    return out.decode()
 
 
 ###############################################################################
 # 3) Converting XML to JSON
 ###############################################################################
 
+def _json_dumps(obj, indent=False):
+    # Serialize obj, with two-space indentation or on one line. orjson
+    # writes non-ASCII characters as they are and leaves out the spaces
+    # after separators on one line; the json fallback keeps the json.dumps
+    # defaults (\uXXXX escapes, ', ' and ': ').
+    if HAVE_ORJSON:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass  # nested deeper than orjson's limit of 255 levels; json goes further
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj)
+
+
+# Parse JSON from a str or UTF-8 bytes; both raise a ValueError subclass on bad input.
+_json_loads = orjson.loads if HAVE_ORJSON else json.loads
+
+
+# Iterate over the child elements only. lxml also keeps comments and
+# processing instructions in the tree; iterchildren(ET.Element) skips them
+# in C. The standard library parser drops them while parsing.
+_element_children = (lambda elem: elem.iterchildren(ET.Element)) if HAVE_LXML else iter
+
+# The encoding pseudo-attribute of a leading XML declaration.
+_XML_DECL_ENCODING_RE = re.compile(r"""^(\ufeff?\s*<\?xml\b[^>]*?)\s+encoding\s*=\s*(["'])[^"']*\2""")
+
+
 def xml_to_json(xml_str):
     """
-    Convert the XML to a JSON-style string using ElementTree.
+    Convert the XML to a JSON-style string using ElementTree (lxml if available).
+    xml_str may be a str or the raw bytes of the document.
     If parsing fails, return None.
     """
-    import xml.etree.ElementTree as ET
+    if isinstance(xml_str, str):
+        # lxml refuses str input that carries an encoding declaration, so the
+        # text is handed over as UTF-8. It is already decoded, so drop any
+        # declared encoding; otherwise the parser would decode it a second
+        # time (e.g. as ISO-8859-1) and garble non-ASCII characters.
+        xml_str = _XML_DECL_ENCODING_RE.sub(r'\1', xml_str, count=1).encode('utf-8')
     try:
-        root = ET.fromstring(xml_str)
+        root = ET.fromstring(xml_str, ET.XMLParser(**_HUGE_TREE))
     except ET.ParseError:
         return None  # Not well-formed
 
-    def elem_to_dict(elem):
-        d = {}
-        for child in elem:
-            child_name = child.tag
-            child_dict = elem_to_dict(child)
-            if child_name not in d:
-                d[child_name] = []
-            d[child_name].append(child_dict)
-        text_content = (elem.text or "").strip()
-        if text_content:
-            d["text"] = text_content
-        return d
+    # Build the nested dicts with an explicit stack instead of recursion, so
+    # deep documents can't hit the recursion limit. Each entry holds an
+    # element, the iterator over its children and the dict being filled.
+    root_body = {}
+    stack = [(root, _element_children(root), root_body)]
+    while stack:
+        elem, children, d = stack[-1]
+        for child in children:
+            child_dict = {}
+            d.setdefault(child.tag, []).append(child_dict)
+            stack.append((child, _element_children(child), child_dict))
+            break
+        else:
+            # All children are done; the text goes after them, as before.
+            stack.pop()
+            text_content = (elem.text or "").strip()
+            if text_content:
+                d["text"] = text_content
 
-    root_dict = {root.tag: elem_to_dict(root)}
-    import json
-    return json.dumps(root_dict, indent=2)
+    root_dict = {root.tag: root_body}
+    try:
+        return _json_dumps(root_dict, indent=True)
+    except RecursionError:
+        return None  # too deeply nested for the JSON encoder
 
 
 ###############################################################################
 # 4) Minifying XML
 ###############################################################################
 
+# Either a whitespace run that contains a newline, or whitespace between two tags.
+# The lookbehind lets a run be tried only from its first character: retrying
+# from every later one would make a long run without a newline quadratic.
+_MINIFY_RE = re.compile(r"(?<!\s)\s*\n\s*|>\s+<")
+
+
+def _minify_repl(match):
+    # Whitespace between tags keeps the two brackets; newline runs just vanish.
+    return "><" if match.group().startswith(">") else ""
+
+
 def minify_xml(xml_str):
     """
     Remove extra whitespace, newlines, and indentation to produce a compact XML.
+    Both kinds of whitespace are removed in a single pass of one compiled pattern.
     """
-    no_newline = re.sub(r"\s*\n\s*", "", xml_str)
-    collapsed = re.sub(r">\s+<", "><", no_newline)
-    return collapsed.strip()
+    return _MINIFY_RE.sub(_minify_repl, xml_str).strip()
+
+
+def minify_stream(fin, fout, buf=1 << 20):
+    """
+    Minify the text read from the file object fin and write it to fout,
+    holding about buf characters in memory instead of the whole document.
+    Writes exactly what minify_xml(fin.read()) would return.
+    """
+    # Everything up to the trailing whitespace, and up to a '>' right before
+    # it, is written out: no match of _MINIFY_RE can run across that cut.
+    # Only that '>' and the whitespace are held back. Once the whitespace
+    # contains a newline, the whole run is removed (or becomes "><" between
+    # tags) whatever else it holds, so it is kept as a single '\n'. Without
+    # a newline it has to be written as it is, so its pieces are collected
+    # and joined once, when the run ends.
+    gt = ''  # '>' if the held whitespace follows a '>'
+    space = []
+    newline = False
+    started = False  # becomes True once the leading whitespace is stripped
+    while True:
+        chunk = fin.read(buf)
+        if chunk.isspace():
+            if newline or '\n' in chunk:
+                space = ['\n']
+                newline = True
+            else:
+                space.append(chunk)
+            continue
+        text = gt + ''.join(space) + chunk
+        if chunk:
+            cut = len(text.rstrip())
+            gt = ''
+            if text[cut - 1] == '>':
+                cut -= 1
+                gt = '>'
+            rest = text[cut + len(gt):]
+            newline = '\n' in rest
+            space = ['\n'] if newline else [rest]
+            out = _MINIFY_RE.sub(_minify_repl, text[:cut])
+        else:
+            out = _MINIFY_RE.sub(_minify_repl, text).rstrip()
+        if not started:
+            out = out.lstrip()
+            started = bool(out)
+        fout.write(out)
+        if not chunk:
+            return
 
 
 ###############################################################################
@@ -212,165 +467,333 @@ def decompress_data(compressed_str, merges_map):
 # 6) Building and Analyzing the Social Network
 ###############################################################################
 
+# Patterns used by SocialNetwork.build_from_xml_fast. The fields are read
+# with [^<]*, which stops right at the closing tag, so there is nothing to
+# backtrack over.
+_USER_RE = re.compile(r"<user>(.*?)</user>", re.DOTALL)
+_SECTION_RE = re.compile(r"<(posts|followers)>(.*?)</\1>", re.DOTALL)
+_ID_RE = re.compile(r"<id>([^<]*)</id>")
+_NAME_RE = re.compile(r"<name>([^<]*)</name>")
+_POST_RE = re.compile(r"<post>(.*?)</post>", re.DOTALL)
+_BODY_RE = re.compile(r"<body>([^<]*)</body>")
+_TOPIC_RE = re.compile(r"<topic>([^<]*)</topic>")
+_FOLLOWER_RE = re.compile(r"<follower>\s*<id>([^<]*)</id>")
+
+
 class SocialNetwork:
     """
     Represents users and their connections based on follower data.
-    Each user is stored in a DynamicArray with an ID, name, posts, and
+    Each user has an ID, a name, posts (a SinglyLinkedList), and
     followers (as a DynamicArray of user IDs).
     """
 
     def __init__(self):
-        # Each entry in self.users is a dict:
-        # {
-        #   'id': str,
-        #   'name': str,
-        #   'posts': SinglyLinkedList(),  # each post has { 'body': str, 'topics': [list] }
-        #   'followers': DynamicArray()   # user IDs of those who follow this user
-        # }
-        self.users = DynamicArray()
+        self._reset()
+
+    def _reset(self):
+        # Start over with an empty network.
+        # The users are stored column-wise, in dicts keyed by user ID. Dicts
+        # keep insertion order, so iterating any of them follows the document.
+        #   names[uid]         -> str
+        #   posts[uid]         -> SinglyLinkedList, each post is
+        #                         { 'body': str, 'body_lower': str, 'topics': [list],
+        #                           'topics_norm': frozenset }
+        #   followers[uid]     -> DynamicArray of the IDs following this user
+        #   followers_set[uid] -> the same IDs as a set, for O(1) membership tests
+        # A loop that needs one field per user only touches that one dict.
+        self.names = {}
+        self.posts = {}
+        self.followers = {}
+        self.followers_set = {}
+        # follower ID -> set of user IDs they follow (the reverse of followers)
+        self._follows = defaultdict(set)
+        # user ID -> digest of its <user> element, filled by update_from_path
+        self._user_digests = {}
+        # normalized topic -> {user ID: [posts with that topic]}, so a topic
+        # search only visits the matching posts
+        self._topic_index = defaultdict(dict)
+        # 'active' / 'influencer' -> result of find_most_active/influencer,
+        # kept until a user or follower is added
+        self._extremes = {}
 
     def add_user(self, user_id, name):
         # Only add the user if it doesn't exist yet.
-        if self.find_user_index(user_id) != -1:
+        if user_id in self.names:
             return
-        user_info = {
-            'id': user_id,
-            'name': name,
-            'posts': SinglyLinkedList(),
-            'followers': DynamicArray()
-        }
-        self.users.append(user_info)
-
-    def find_user_index(self, user_id):
-        # Return the index of the user in self.users, or -1 if not found.
-        for i in range(len(self.users)):
-            if self.users.get(i)['id'] == user_id:
-                return i
-        return -1
+        if self._extremes:
+            self._extremes.clear()
+        self.names[user_id] = name
+        self.posts[user_id] = SinglyLinkedList()
+        self.followers[user_id] = DynamicArray()
+        self.followers_set[user_id] = set()
 
     def add_follower(self, user_id, follower_id):
         # If user_id is followed by follower_id, store follower_id in user_id's followers.
-        idx = self.find_user_index(user_id)
-        if idx == -1:
+        fset = self.followers_set.get(user_id)
+        if fset is None:
             return
-        user_data = self.users.get(idx)
         # Make sure it's not already in the list
-        for j in range(len(user_data['followers'])):
-            if user_data['followers'].get(j) == follower_id:
-                return
-        user_data['followers'].append(follower_id)
+        if follower_id in fset:
+            return
+        if self._extremes:
+            self._extremes.clear()
+        self.followers[user_id].append(follower_id)
+        fset.add(follower_id)
+        self._follows[follower_id].add(user_id)
 
     def add_post(self, user_id, body, topics):
         # Insert a new post into the user's posts list.
-        idx = self.find_user_index(user_id)
-        if idx == -1:
+        posts = self.posts.get(user_id)
+        if posts is None:
             return
-        user_data = self.users.get(idx)
-        user_data['posts'].insert_at_tail({'body': body, 'topics': topics})
+        # body_lower and topics_norm hold the lowercased body and the stripped,
+        # lowercased topics once, so searches don't normalize on every query.
+        post = {
+            'body': body,
+            'body_lower': body.lower(),
+            'topics': topics,
+            'topics_norm': frozenset(t.strip().lower() for t in topics),
+        }
+        posts.insert_at_tail(post)
+        self._index_post(user_id, post)
+
+    def _index_post(self, user_id, post):
+        # Add the post to the topic index under each of its topics.
+        for topic in post['topics_norm']:
+            self._topic_index[topic].setdefault(user_id, []).append(post)
 
     def build_from_xml(self, xml_str):
         """
         Parse an XML structure for <users>. Each <user>
         has <id>, <name>, <posts>, <followers>, etc.
+        xml_str may be a str, bytes, or a readable binary file-like object
+        (such as an open file or an mmap).
+        The document is streamed with iterparse: every <user> is ingested as
+        soon as it has been parsed and then dropped from the tree, so only
+        one user's subtree is held in memory at a time. If the document turns
+        out to be malformed, the network is left empty.
         """
-        import xml.etree.ElementTree as ET
+        if isinstance(xml_str, str):
+            xml_str = xml_str.encode('utf-8')
+        source = xml_str if hasattr(xml_str, 'read') else io.BytesIO(xml_str)
+        self._parse_users(source, self._ingest_user)
+
+    def _parse_users(self, source, ingest):
+        # Stream <user> elements from source and pass each one to ingest().
         try:
-            root = ET.fromstring(xml_str)
+            if HAVE_LXML:
+                for _, elem in ET.iterparse(source, events=('end',), tag='user', huge_tree=True):
+                    ingest(elem)
+                    elem.clear()
+                    # Also remove the already-processed users before this one.
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+            else:
+                # The standard library has no parent links, so we grab the
+                # root from the first 'start' event and empty it instead.
+                context = ET.iterparse(source, events=('start', 'end'))
+                _, root = next(context)
+                for event, elem in context:
+                    if event == 'end' and elem.tag == 'user':
+                        ingest(elem)
+                        root.clear()
         except ET.ParseError:
-            return
-        for user_elem in root.findall('user'):
-            uid = user_elem.findtext('id', '').strip()
-            uname = user_elem.findtext('name', '').strip()
+            # Like parsing the whole document first: malformed XML gives an
+            # empty network, not the users that happened to come before the error.
+            self._reset()
+
+    def build_from_path(self, path):
+        """
+        Build the network straight from an XML file on disk. iterparse reads
+        the file in chunks, so the document never exists as one Python string.
+        """
+        with open(path, 'rb') as f:
+            self.build_from_xml(f)
+
+    def update_from_path(self, path, prev_snet=None):
+        """
+        Build the network from path like build_from_path, reusing the data of
+        every user whose <user> element is byte-for-byte the same as when
+        prev_snet was built, so after a small edit only the changed users are
+        extracted again. Users no longer in the file are simply not carried
+        over. prev_snet must itself come from update_from_path (it records a
+        digest per user); otherwise every user is extracted as usual.
+        """
+        prev_digests = prev_snet._user_digests if prev_snet is not None else {}
+        reused = set()
+
+        def ingest(elem):
+            digest = hashlib.blake2b(ET.tostring(elem), digest_size=16).digest()
+            uid = elem.findtext('id', '').strip()
+            if uid in self.names:
+                # A repeated ID adds to the first user, so its data no longer
+                # matches a single element: never reuse it.
+                self._user_digests[uid] = None
+                if uid in reused:
+                    self._unshare_user(uid)
+                    reused.discard(uid)
+                self._ingest_user(elem)
+                return
+            self._user_digests[uid] = digest
+            if digest == prev_digests.get(uid):
+                self._reuse_user(prev_snet, uid)
+                reused.add(uid)
+            else:
+                self._ingest_user(elem)
+
+        with open(path, 'rb') as f:
+            self._parse_users(f, ingest)
+
+    def _reuse_user(self, other, uid):
+        # Add a user from another network, sharing its posts and followers.
+        # Neither network changes them afterwards (see _unshare_user).
+        self._extremes.clear()
+        self.names[uid] = other.names[uid]
+        self.posts[uid] = other.posts[uid]
+        self.followers[uid] = other.followers[uid]
+        self.followers_set[uid] = other.followers_set[uid]
+        for follower_id in self.followers[uid]:
+            self._follows[follower_id].add(uid)
+        for post in self.posts[uid]:
+            self._index_post(uid, post)
+
+    def _unshare_user(self, user_id):
+        # Give a reused user its own copies before more data is added to it.
+        posts = SinglyLinkedList()
+        for post in self.posts[user_id]:
+            posts.insert_at_tail(post)
+        self.posts[user_id] = posts
+        followers = DynamicArray()
+        followers.extend(self.followers[user_id])
+        self.followers[user_id] = followers
+        self.followers_set[user_id] = set(self.followers_set[user_id])
+
+    def _ingest_user(self, user_elem):
+        """
+        Add one parsed <user> element (id, name, posts, followers) to the network.
+        """
+        uid = user_elem.findtext('id', '').strip()
+        uname = user_elem.findtext('name', '').strip()
+        self.add_user(uid, uname)
+
+        # Extract posts
+        posts_elem = user_elem.find('posts')
+        if posts_elem is not None:
+            for post_elem in posts_elem.findall('post'):
+                body = post_elem.findtext('body', '').strip()
+                topics_list = []
+                topics_elem = post_elem.find('topics')
+                if topics_elem is not None:
+                    for t in topics_elem.findall('topic'):
+                        topics_list.append(t.text.strip())
+                self.add_post(uid, body, topics_list)
+
+        # Extract followers
+        foll_elem = user_elem.find('followers')
+        if foll_elem is not None:
+            for f in foll_elem.findall('follower'):
+                follower_id = f.findtext('id', '').strip()
+                self.add_follower(uid, follower_id)
+
+    def build_from_xml_fast(self, xml_str):
+        """
+        Regex-based alternative to build_from_xml for input that is already
+        known to be well-formed (e.g. it passed verify) and follows the usual
+        <users>/<user> layout. No element tree is built; each <user> block is
+        cut out with one compiled pattern and its fields are read with small
+        patterns that stop at the closing tag.
+        Comments, CDATA and attributes are not handled, so use build_from_xml
+        for anything else. The CLI uses this for its --fast option.
+        """
+        if isinstance(xml_str, bytes):
+            xml_str = xml_str.decode('utf-8', errors='replace')
+        for user_match in _USER_RE.finditer(xml_str):
+            block = user_match.group(1)
+            # Take <id>/<name> from the user itself, not from nested posts/followers.
+            sections = {'posts': '', 'followers': ''}
+            for sec in _SECTION_RE.finditer(block):
+                sections[sec.group(1)] += sec.group(2)
+            own = _SECTION_RE.sub('', block)
+            id_match = _ID_RE.search(own)
+            name_match = _NAME_RE.search(own)
+            uid = unescape(id_match.group(1)).strip() if id_match else ''
+            uname = unescape(name_match.group(1)).strip() if name_match else ''
             self.add_user(uid, uname)
 
-            # Extract posts
-            posts_elem = user_elem.find('posts')
-            if posts_elem is not None:
-                for post_elem in posts_elem.findall('post'):
-                    body = post_elem.findtext('body', '').strip()
-                    topics_list = []
-                    topics_elem = post_elem.find('topics')
-                    if topics_elem is not None:
-                        for t in topics_elem.findall('topic'):
-                            topics_list.append(t.text.strip())
-                    self.add_post(uid, body, topics_list)
-
-            # Extract followers
-            foll_elem = user_elem.find('followers')
-            if foll_elem is not None:
-                for f in foll_elem.findall('follower'):
-                    follower_id = f.findtext('id', '').strip()
-                    self.add_follower(uid, follower_id)
+            for post in _POST_RE.finditer(sections['posts']):
+                post_block = post.group(1)
+                body_match = _BODY_RE.search(post_block)
+                body = unescape(body_match.group(1)).strip() if body_match else ''
+                topics_list = [unescape(t).strip()
+                               for t in _TOPIC_RE.findall(post_block)]
+                self.add_post(uid, body, topics_list)
+
+            for follower_id in _FOLLOWER_RE.findall(sections['followers']):
+                self.add_follower(uid, unescape(follower_id).strip())
 
     def to_networkx(self):
         """
         Convert the adjacency info to a NetworkX DiGraph for easy visualization.
         For a user U, each follower F => an edge F -> U (meaning F follows U).
         """
+        import networkx as nx
         G = nx.DiGraph()
-        # Add nodes
-        for i in range(len(self.users)):
-            data = self.users.get(i)
-            G.add_node(data['id'], name=data['name'], posts=data['posts'].to_list())
-        # Add edges
-        for i in range(len(self.users)):
-            data = self.users.get(i)
-            uid = data['id']
-            for j in range(len(data['followers'])):
-                fid = data['followers'].get(j)
-                G.add_edge(fid, uid)
+        # Add all nodes, then all edges, in one bulk call each.
+        G.add_nodes_from(
+            (uid, {'name': name, 'posts': self.posts[uid].to_list()})
+            for uid, name in self.names.items()
+        )
+        G.add_edges_from(
+            (fid, uid) for uid, fids in self.followers.items() for fid in fids
+        )
         return G
 
     def find_most_active(self):
         """
         Return the user who follows the most people.
         We'll count how many times each user ID appears in others' followers.
+        The answer is kept until the network changes.
         """
-        following_count = {}
-        # Initialize all counts
-        for i in range(len(self.users)):
-            uid = self.users.get(i)['id']
-            following_count[uid] = 0
-
-        # If user B is in user A's followers, that means B -> A,
-        # so B is following A. We'll increment B's count.
-        for i in range(len(self.users)):
-            udata = self.users.get(i)
-            for j in range(len(udata['followers'])):
-                fid = udata['followers'].get(j)
-                following_count[fid] = following_count.get(fid, 0) + 1
-
-        # Find the maximum outdegree
-        max_user = None
-        max_val = -1
-        for user_id, val in following_count.items():
-            if val > max_val:
-                max_val = val
-                max_user = user_id
-
-        if max_user is not None:
-            idx = self.find_user_index(max_user)
-            if idx != -1:
-                return (max_user, self.users.get(idx)['name'], max_val)
+        result = self._extremes.get('active')
+        if result is None:
+            result = self._extremes['active'] = self._compute_most_active()
+        return result
+
+    def _compute_most_active(self):
+        # The reverse index already holds, for every follower, the set of
+        # users they follow, so each count is just the size of that set.
+        # Every user is listed first (at 0 if they follow nobody), then the
+        # follower IDs that aren't users themselves.
+        follows = self._follows
+        following_count = {uid: len(follows.get(uid, ())) for uid in self.names}
+        for fid, followed in follows.items():
+            following_count.setdefault(fid, len(followed))
+
+        if following_count:
+            # max keeps the first user seen when counts are tied.
+            max_user = max(following_count, key=following_count.__getitem__)
+            max_val = following_count[max_user]
+            if max_user in self.names:
+                return (max_user, self.names[max_user], max_val)
         return (None, None, 0)
 
     def find_most_influencer(self):
         """
         Return the user with the highest number of followers.
+        The answer is kept until the network changes.
         """
-        max_user = None
-        max_val = -1
-        max_name = None
-        for i in range(len(self.users)):
-            udata = self.users.get(i)
-            uid = udata['id']
-            name = udata['name']
-            fcount = len(udata['followers'])
-            if fcount > max_val:
-                max_val = fcount
-                max_user = uid
-                max_name = name
-        return (max_user, max_name, max_val)
+        result = self._extremes.get('influencer')
+        if result is None:
+            result = self._extremes['influencer'] = self._compute_most_influencer()
+        return result
+
+    def _compute_most_influencer(self):
+        if not self.followers:
+            return (None, None, -1)
+        # max keeps the first user seen when counts are tied.
+        followers = self.followers
+        max_user = max(followers, key=lambda uid: len(followers[uid]))
+        return (max_user, self.names[max_user], len(followers[max_user]))
 
     def mutual_followers(self, user_ids):
         """
@@ -378,16 +801,21 @@ class SocialNetwork:
         """
         if not user_ids:
             return []
-        idx_first = self.find_user_index(user_ids[0])
-        if idx_first == -1:
-            return []
-        common = set(self.users.get(idx_first)['followers'].to_list())
-        for uid in user_ids[1:]:
-            idx = self.find_user_index(uid)
-            if idx == -1:
+        followers_set = self.followers_set
+        sets = []
+        for uid in user_ids:
+            fset = followers_set.get(uid)
+            if fset is None:
+                return []
+            sets.append(fset)
+        # Start from the smallest set, so every intersection is at most that
+        # big, and stop as soon as nobody is left.
+        sets.sort(key=len)
+        common = sets[0]
+        for fset in sets[1:]:
+            common = common & fset
+            if not common:
                 return []
-            fset = set(self.users.get(idx)['followers'].to_list())
-            common = common.intersection(fset)
         return list(common)
 
     def suggest_follows(self, user_id):
@@ -395,27 +823,19 @@ class SocialNetwork:
         Suggest new accounts for user_id to follow based on
         "followers of my followers" that user_id doesn't already follow.
         """
-        idx = self.find_user_index(user_id)
-        if idx == -1:
+        if user_id not in self.names:
             return []
-        # Identify who user_id already follows
-        # If user_id is in X's followers, that means user_id -> X.
-        # So we search for all X where user_id is in X's followers list.
-        currently_follows = set()
-        for i in range(len(self.users)):
-            udata = self.users.get(i)
-            if user_id in udata['followers'].to_list():
-                currently_follows.add(udata['id'])
+        # Who user_id already follows comes straight from the reverse index.
+        currently_follows = self._follows.get(user_id, set())
 
         # Then find second-level accounts: the followers of the accounts we follow.
         suggestions = set()
         for followed_user in currently_follows:
-            f_idx = self.find_user_index(followed_user)
-            if f_idx != -1:
-                their_followers = self.users.get(f_idx)['followers'].to_list()
-                for fol in their_followers:
-                    if fol != user_id and fol not in currently_follows:
-                        suggestions.add(fol)
+            fset = self.followers_set.get(followed_user)
+            if fset is not None:
+                suggestions |= fset
+        suggestions -= currently_follows
+        suggestions.discard(user_id)
         return list(suggestions)
 
     def search_posts_word(self, word):
@@ -423,38 +843,42 @@ class SocialNetwork:
         Find any posts containing 'word' in their body (case-insensitive).
         Returns a list of (user_id, user_name, post_body).
         """
-        results = []
+        return list(self.iter_posts_word(word))
+
+    def iter_posts_word(self, word):
+        """
+        Generator version of search_posts_word: yields each match as it is found.
+        """
+        names = self.names
         w_lower = word.lower()  # Normalize the word to lowercase
-        for i in range(len(self.users)):
-            udata = self.users.get(i)
-            uid = udata['id']
-            uname = udata['name']
-            p = udata['posts'].head
-            while p:
-                body_txt = p.value['body'].strip()  # Clean up whitespace
-                if w_lower in body_txt.lower():  # Case-insensitive comparison
-                    results.append((uid, uname, body_txt))
-                p = p.next
-        return results
+        for uid, posts in self.posts.items():
+            uname = names[uid]
+            for post in posts:
+                # The body was lowercased once at ingest, so this is a plain substring test.
+                if w_lower in post['body_lower']:
+                    yield (uid, uname, post['body'])
 
     def search_posts_topic(self, topic):
         """
         Find any posts that have 'topic' in their topics list (case-insensitive).
         Returns a list of (user_id, user_name, post_body).
         """
-        results = []
+        return list(self.iter_posts_topic(topic))
+
+    def iter_posts_topic(self, topic):
+        """
+        Generator version of search_posts_topic: yields each match as it is found.
+        """
         t_lower = topic.lower()  # Normalize the topic to lowercase
-        for i in range(len(self.users)):
-            udata = self.users.get(i)
-            uid = udata['id']
-            uname = udata['name']
-            p = udata['posts'].head
-            while p:
-                topics_list = [t.strip().lower() for t in p.value['topics']]  # Normalize all topics
-                if t_lower in topics_list:  # Check if the normalized topic matches
-                    results.append((uid, uname, p.value['body']))
-                p = p.next
-        return results
+        # The topic index lists exactly the matching posts, grouped by user.
+        by_user = self._topic_index.get(t_lower)
+        if not by_user:
+            return
+        names = self.names
+        for uid, posts in by_user.items():
+            uname = names[uid]
+            for post in posts:
+                yield (uid, uname, post['body'])
 
 
 def draw_network(social_net):
@@ -462,6 +886,8 @@ def draw_network(social_net):
     Display the social network using NetworkX and matplotlib.
     Edges go from follower to the user they follow.
     """
+    import networkx as nx
+    import matplotlib.pyplot as plt
     G = social_net.to_networkx()
     if len(G.nodes) == 0:
         print("No users in network.")
@@ -481,7 +907,153 @@ def draw_network(social_net):
 # 8) Command-Line Interface
 ###############################################################################
 
-def cli_main():
+def _read_input(input_file, mode='text'):
+    """
+    Read an input file (the GUI reads its files through this as well).
+    mode='text' returns a str and mode='bytes' the raw bytes.
+    """
+    with open(input_file, 'rb') as f:
+        if mode == 'bytes' or os.fstat(f.fileno()).st_size == 0:
+            data = f.read()  # an empty file can't be memory-mapped
+            return data.decode('utf-8') if mode == 'text' else data
+        # Decode straight from the mapped file, so the document exists once
+        # as a str rather than first as bytes as well.
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, 'utf-8', 'replace')
+    if '\r' in text:
+        # Universal newlines, as reading the file in text mode gives.
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+# With --cache, networks built by the CLI are pickled here, one file per
+# input path, together with the stamp of the file they were built from.
+# Running several commands on the same unchanged file parses it only once,
+# and after an edit only the changed users are extracted again. Bump the
+# version whenever the layout of SocialNetwork changes, so old pickles are
+# ignored.
+_NETWORK_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'xml_editor')
+_NETWORK_CACHE_VERSION = 4
+
+# What pickle.load raises on a truncated, corrupt or outdated cache file.
+_UNPICKLE_ERRORS = (pickle.UnpicklingError, EOFError, AttributeError, ImportError,
+                    IndexError, KeyError, TypeError, ValueError, OverflowError)
+
+
+def _network_schema():
+    # What a pickle must have been written with to be loaded: the cache
+    # version plus the attribute names of a SocialNetwork. A layout change
+    # that forgot the version bump still invalidates the old pickles.
+    return (_NETWORK_CACHE_VERSION, tuple(sorted(vars(SocialNetwork()))))
+
+
+def _network_cache_file(input_file):
+    # The cache file name is a hash of the absolute path of the input.
+    key = f"{_NETWORK_CACHE_VERSION}:{os.path.abspath(input_file)}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(_NETWORK_CACHE_DIR, digest + '.pkl')
+
+
+def _load_network(input_file, fast=False, cache=False):
+    """
+    Build the SocialNetwork for the input file by streaming it through the
+    parser. With fast=True the file is read with build_from_xml_fast instead,
+    which assumes well-formed input in the usual layout.
+    With cache=True the network is kept on disk for the next command: if this
+    version of the file was already parsed it is loaded from there, otherwise
+    the users of the cached older version that are unchanged are reused
+    (see update_from_path).
+    """
+    snet = SocialNetwork()
+    if fast:
+        snet.build_from_xml_fast(_read_input(input_file))
+        return snet
+    if not cache:
+        snet.build_from_path(input_file)
+        return snet
+    cache_file = _network_cache_file(input_file)
+    st = os.stat(input_file)
+    stamp = (st.st_mtime_ns, st.st_size)
+    schema = _network_schema()
+    prev = None
+    try:
+        with open(cache_file, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError,) + _UNPICKLE_ERRORS:
+        payload = None  # not cached yet, or unreadable: build it below
+    if type(payload) is tuple and len(payload) == 3 and payload[0] == schema:
+        _, cached_stamp, cached = payload
+        if cached_stamp == stamp:
+            return cached
+        prev = cached
+
+    snet.update_from_path(input_file, prev)
+
+    # Write to a temporary name first so other processes never see half a file.
+    try:
+        os.makedirs(_NETWORK_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump((schema, stamp, snet), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # caching is optional, e.g. on a read-only home directory
+    return snet
+
+
+# Subcommands understood by cli_main, with their help text.
+_CLI_COMMANDS = {
+    'verify': "check that every tag is closed properly",
+    'format': "indent the XML",
+    'json': "convert the XML to JSON",
+    'mini': "remove the whitespace between tags",
+    'compress': "compress the file with byte pair encoding",
+    'decompress': "restore a file written by compress",
+    'draw': "draw the social network graph",
+    'search': "search posts by word (-w) or topic (-t)",
+    'most_active': "user who follows the most people",
+    'most_influencer': "user with the most followers",
+    'mutual': "users who follow all of the given ids",
+    'suggest': "accounts a user could follow",
+}
+
+
+# Subcommands that work on the social network built from the file.
+_NETWORK_COMMANDS = ('draw', 'search', 'most_active', 'most_influencer', 'mutual', 'suggest')
+
+
+def _build_parser():
+    """
+    Build the argparse parser for the CLI: one subcommand per operation,
+    each accepting -i/-o plus its own options. argv is parsed in one pass.
+    """
+    parser = argparse.ArgumentParser(prog='xml_editor')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    for name, help_text in _CLI_COMMANDS.items():
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('-i', dest='input_file', metavar='file')
+        sub.add_argument('-o', dest='output_file', metavar='file')
+        if name == 'verify':
+            sub.add_argument('--fix', action='store_true')
+        elif name == 'search':
+            sub.add_argument('-w', dest='word')
+            sub.add_argument('-t', dest='topic')
+        elif name == 'mutual':
+            sub.add_argument('-ids', dest='ids', metavar='id1,id2,...')
+        elif name == 'suggest':
+            sub.add_argument('-id', dest='id', metavar='user_id')
+        if name in _NETWORK_COMMANDS:
+            sub.add_argument('--fast', action='store_true',
+                             help="read the users with regexes instead of an XML parser "
+                                  "(only for well-formed files in the usual layout)")
+            sub.add_argument('--cache', action='store_true',
+                             help="keep the built network in " + _NETWORK_CACHE_DIR +
+                                  " and reuse it while the file is unchanged")
+    return parser
+
+
+def cli_main(argv=None):
     """
     This function handles command-line usage:
       xml_editor verify -i <file> [--fix] ...
@@ -497,44 +1069,51 @@ def cli_main():
       xml_editor most_influencer -i <file> ...
       xml_editor mutual -i <file> -ids 1,2,...
       xml_editor suggest -i <file> -id 1 ...
+    argv is the argument list without the program name (default: sys.argv[1:]).
     """
-    argv = sys.argv[1:]
+    if argv is None:
+        argv = sys.argv[1:]
     if not argv:
         print("No command provided.")
         sys.exit(1)
 
-    command = argv[0]
-    if '-i' in argv:
-        in_idx = argv.index('-i') + 1
-        input_file = argv[in_idx] if in_idx < len(argv) else None
-    else:
-        input_file = None
+    parser = _build_parser()
+    if argv[0] == 'help':
+        parser.print_help()
+        return
+    if argv[0] not in _CLI_COMMANDS and not argv[0].startswith('-'):
+        print(f"Unknown command: {argv[0]}")
+        sys.exit(1)
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
 
+    command = args.command
+    input_file = args.input_file
     if not input_file or not os.path.isfile(input_file):
-        if command not in ['help', '-h', '--help']:
-            print("Input file not found or not specified. Use -i <filename>")
-            sys.exit(1)
-
-    output_file = None
-    if '-o' in argv:
-        out_idx = argv.index('-o') + 1
-        if out_idx < len(argv):
-            output_file = argv[out_idx]
+        print("Input file not found or not specified. Use -i <filename>")
+        sys.exit(1)
+    output_file = args.output_file
 
     if command == 'verify':
-        auto_fix = '--fix' in argv
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        ok, fixed, msg = verify_xml_structure(xstr, auto_fix=auto_fix)
-        print(msg)
-        if ok and auto_fix and output_file:
-            with open(output_file, 'w', encoding='utf-8') as fw:
-                fw.write(fixed)
-            print(f"Fixed XML saved to {output_file}")
+        auto_fix = args.fix
+        if auto_fix:
+            xstr = _read_input(input_file)
+            ok, fixed, msg = verify_xml_structure(xstr, auto_fix=auto_fix)
+            print(msg)
+            if ok and output_file:
+                with open(output_file, 'w', encoding='utf-8') as fw:
+                    fw.write(fixed)
+                print(f"Fixed XML saved to {output_file}")
+        else:
+            # Nothing to write back, so check the file as it streams in.
+            with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
+                ok, msg = verify_stream(f)
+            print(msg)
 
     elif command == 'format':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
+        xstr = _read_input(input_file)
         formatted = format_xml(xstr)
         if output_file:
             with open(output_file, 'w', encoding='utf-8') as fw:
@@ -544,8 +1123,8 @@ def cli_main():
             print(formatted)
 
     elif command == 'json':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
+        # The parser takes the raw bytes, so skip decoding them to str first.
+        xstr = _read_input(input_file, 'bytes')
         j = xml_to_json(xstr)
         if j is None:
             print("Error: invalid XML. Could not convert to JSON.")
@@ -558,26 +1137,24 @@ def cli_main():
                 print(j)
 
     elif command == 'mini':
+        # Minify while reading, so the document is never held in memory whole.
         with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        mini_str = minify_xml(xstr)
-        if output_file:
-            with open(output_file, 'w', encoding='utf-8') as fw:
-                fw.write(mini_str)
-            print(f"Minified XML saved to {output_file}")
-        else:
-            print(mini_str)
+            if output_file:
+                with open(output_file, 'w', encoding='utf-8') as fw:
+                    minify_stream(f, fw)
+                print(f"Minified XML saved to {output_file}")
+            else:
+                minify_stream(f, sys.stdout)
+                print()
 
     elif command == 'compress':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            data_str = f.read()
+        data_str = _read_input(input_file)
         compressed, merges_map = compress_data(data_str)
-        import json
         bundle = {
             'compressed': compressed,
             'merges_map': merges_map
         }
-        out_str = json.dumps(bundle)
+        out_str = _json_dumps(bundle)
         if output_file:
             with open(output_file, 'w', encoding='utf-8') as fw:
                 fw.write(out_str)
@@ -586,55 +1163,47 @@ def cli_main():
             print(out_str)
 
     elif command == 'decompress':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            bundle_json = f.read()
-        import json
-        try:
-            bundle = json.loads(bundle_json)
-            cstr = bundle['compressed']
-            merges_map = bundle['merges_map']
-            original = decompress_data(cstr, merges_map)
-            if output_file:
-                with open(output_file, 'w', encoding='utf-8') as fw:
-                    fw.write(original)
-                print(f"Decompressed data saved to {output_file}")
-            else:
-                print(original)
-        except:
+        bundle_json = _read_input(input_file, 'bytes')  # _json_loads accepts UTF-8 bytes
+        original = None
+        # A bundle is a JSON object; anything else is rejected without parsing.
+        if bundle_json.lstrip()[:1] == b'{':
+            try:
+                bundle = _json_loads(bundle_json)
+                original = decompress_data(bundle['compressed'], bundle['merges_map'])
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # Malformed JSON, or JSON of the wrong shape.
+                pass
+        if original is None:
             print("Error: file doesn't seem to be a valid compressed bundle.")
+        elif output_file:
+            with open(output_file, 'w', encoding='utf-8') as fw:
+                fw.write(original)
+            print(f"Decompressed data saved to {output_file}")
+        else:
+            print(original)
 
     elif command == 'draw':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        snet = SocialNetwork()
-        snet.build_from_xml(xstr)
+        snet = _load_network(input_file, args.fast, args.cache)
         draw_network(snet)
         if output_file:
+            import matplotlib.pyplot as plt
             plt.savefig(output_file)
             print(f"Graph image saved to {output_file}")
 
     elif command == 'search':
         # We can search by word or topic
-        if '-w' in argv:
-            w_idx = argv.index('-w') + 1
-            word = argv[w_idx]
-            with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-                xstr = f.read()
-            snet = SocialNetwork()
-            snet.build_from_xml(xstr)
+        if args.word is not None:
+            word = args.word
+            snet = _load_network(input_file, args.fast, args.cache)
             results = snet.search_posts_word(word)
             if results:
                 for (uid, uname, body) in results:
                     print(f"User {uid} ({uname}) => {body[:60]}...")
             else:
                 print("No posts found with that word.")
-        elif '-t' in argv:
-            t_idx = argv.index('-t') + 1
-            topic = argv[t_idx]
-            with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-                xstr = f.read()
-            snet = SocialNetwork()
-            snet.build_from_xml(xstr)
+        elif args.topic is not None:
+            topic = args.topic
+            snet = _load_network(input_file, args.fast, args.cache)
             results = snet.search_posts_topic(topic)
             if results:
                 for (uid, uname, body) in results:
@@ -645,10 +1214,7 @@ def cli_main():
             print("Usage: xml_editor search -w <word> -i file.xml OR -t <topic> -i file.xml")
 
     elif command == 'most_active':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        snet = SocialNetwork()
-        snet.build_from_xml(xstr)
+        snet = _load_network(input_file, args.fast, args.cache)
         uid, uname, outdeg = snet.find_most_active()
         if uid:
             print(f"Most active user: ID={uid}, Name={uname}, Follows={outdeg}")
@@ -656,10 +1222,7 @@ def cli_main():
             print("No data found or no users in XML.")
 
     elif command == 'most_influencer':
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        snet = SocialNetwork()
-        snet.build_from_xml(xstr)
+        snet = _load_network(input_file, args.fast, args.cache)
         uid, uname, count = snet.find_most_influencer()
         if uid:
             print(f"Most influencer: ID={uid}, Name={uname}, Followers={count}")
@@ -667,28 +1230,20 @@ def cli_main():
             print("No data found or no users in XML.")
 
     elif command == 'mutual':
-        if '-ids' not in argv:
+        if args.ids is None:
             print("Usage: xml_editor mutual -i file.xml -ids 1,2,3")
             sys.exit(1)
-        ids_idx = argv.index('-ids') + 1
-        id_list_str = argv[ids_idx]
-        user_ids = id_list_str.split(',')
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        snet = SocialNetwork()
-        snet.build_from_xml(xstr)
+        user_ids = args.ids.split(',')
+        snet = _load_network(input_file, args.fast, args.cache)
         mutuals = snet.mutual_followers(user_ids)
         print(f"Users who follow all of {user_ids}: {mutuals}")
 
     elif command == 'suggest':
-        if '-id' not in argv:
+        if args.id is None:
             print("Usage: xml_editor suggest -i file.xml -id <user_id>")
             sys.exit(1)
-        user_id = argv[argv.index('-id') + 1]
-        with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
-            xstr = f.read()
-        snet = SocialNetwork()
-        snet.build_from_xml(xstr)
+        user_id = args.id
+        snet = _load_network(input_file, args.fast, args.cache)
         suggestions = snet.suggest_follows(user_id)
         if suggestions:
             print(f"Suggested users for {user_id} to follow: {suggestions}")
@@ -704,10 +1259,84 @@ def cli_main():
 # 9) Graphical User Interface (Tkinter)
 ###############################################################################
 
+# A comma together with the whitespace around it, for the "Mutual IDs" field.
+_ID_SPLIT_RE = re.compile(r"\s*,\s*")
+
+def _bundle_digest(text):
+    # Short digest of a compressed bundle's JSON, to see if the output still shows it.
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+# Result lines joined into one emit() call by _emit_search_results.
+_EMIT_LINES = 256
+
+
+def _emit_search_results(emit, results, header, empty_msg):
+    # Runs on the worker thread: pass the matches to emit() as they are
+    # found, _EMIT_LINES lines at a time so the queue isn't hit per match.
+    found = False
+    lines = []
+    for uid, uname, body in results:
+        if not found:
+            emit(header)
+            found = True
+        lines.append(f"User {uid} ({uname}): {body[:70]}...\n")
+        if len(lines) == _EMIT_LINES:
+            emit("".join(lines))
+            lines.clear()
+    if lines:
+        emit("".join(lines))
+    if not found:
+        emit(empty_msg)
+
+
+def _with_network(method):
+    """
+    Decorator for GUI handlers that work on the social network: the handler
+    is called as method(self, snet) once the network for the selected file
+    is available, and not at all if the file can't be read.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._request_network(lambda snet: method(self, snet, *args, **kwargs))
+    return wrapper
+
+
 class XmlEditorGUI:
+    # How many parsed networks to keep; each one holds a whole document.
+    _SNET_CACHE_SIZE = 4
+    # How often (ms) the Tk loop checks whether background work has finished.
+    _POLL_MS = 50
+    # How many verify/format/json/minify/compress results to keep.
+    _OP_CACHE_SIZE = 8
+    # How often (ms) streamed results are copied into the output area.
+    _DRAIN_MS = 16
+    # At most this many characters are inserted per drain tick, so a huge
+    # result set is painted progressively instead of in one long insert.
+    _DRAIN_MAX_CHARS = 1 << 18
+
     def __init__(self, master):
         self.master = master
         self.master.title("XML Editor - Course Project")
+        # (path, stamp) -> SocialNetwork, least recently used first; see _file_stamp.
+        self._snet_cache = OrderedDict()
+        # Parsing runs on this worker thread so the window doesn't freeze.
+        # A single worker finishes requests in the order they were made.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Text produced on the worker for the output area, as (stream id, chunk);
+        # a None chunk ends the stream. Only the Tk thread touches the widget.
+        self._result_q = queue.Queue()
+        self._stream_id = 0
+        self._stream_open = False
+        self._draining = False
+        # (path, stamp, text) of the last file read by _file_op.
+        self._file_cache = None
+        # (path, stamp, operation) -> result, least recently used first.
+        self._op_cache = OrderedDict()
+        # (compressed, merges_map, digest of the shown JSON) from the last
+        # Compress, so Decompress doesn't have to parse it back out of the
+        # text widget.
+        self._last_compressed = None
 
         # File selection area
         file_frame = tk.Frame(self.master)
@@ -720,13 +1349,14 @@ class XmlEditorGUI:
         # Buttons for basic operations
         btn_frame = tk.Frame(self.master)
         btn_frame.pack(fill=tk.X, padx=5, pady=5)
-        tk.Button(btn_frame, text="Verify (Fix)", command=self.gui_verify).pack(side=tk.LEFT, padx=2)
-        tk.Button(btn_frame, text="Format", command=self.gui_format).pack(side=tk.LEFT, padx=2)
-        tk.Button(btn_frame, text="To JSON", command=self.gui_json).pack(side=tk.LEFT, padx=2)
-        tk.Button(btn_frame, text="Minify", command=self.gui_minify).pack(side=tk.LEFT, padx=2)
-        tk.Button(btn_frame, text="Compress", command=self.gui_compress).pack(side=tk.LEFT, padx=2)
-        tk.Button(btn_frame, text="Decompress", command=self.gui_decompress).pack(side=tk.LEFT, padx=2)
-        tk.Button(btn_frame, text="Draw Graph", command=self.gui_draw).pack(side=tk.LEFT, padx=2)
+        for text, command in (("Verify (Fix)", self.gui_verify),
+                              ("Format", self.gui_format),
+                              ("To JSON", self.gui_json),
+                              ("Minify", self.gui_minify),
+                              ("Compress", self.gui_compress),
+                              ("Decompress", self.gui_decompress),
+                              ("Draw Graph", self.gui_draw)):
+            tk.Button(btn_frame, text=text, command=command).pack(side=tk.LEFT, padx=2)
 
         # Buttons for network analysis and searching
         adv_frame = tk.Frame(self.master)
@@ -768,187 +1398,342 @@ class XmlEditorGUI:
         if fname:
             self.file_var.set(fname)
 
-    def _read_xml_file(self):
+    @staticmethod
+    def _file_stamp(path):
+        # Modification time in nanoseconds and size of the file: the caches
+        # treat it as unchanged while both stay the same. Raises OSError.
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _file_op(self, op_name, func, done):
+        """
+        Call done(func(text)) with the text of the selected file, reusing the
+        previous result while the file is unchanged. Only a stat runs on the
+        Tk thread: reading the file and func itself run on the worker thread,
+        so func must not touch any widgets.
+        """
         path = self.file_var.get().strip()
-        if not os.path.isfile(path):
-            messagebox.showerror("Error", f"File not found: {path}")
-            return None
-        with open(path, 'r', encoding='utf-8', errors='replace') as f:
-            return f.read()
+        # One stat gives both "does it exist" and the stamp for the caches;
+        # open() reports anything else (e.g. a directory) itself.
+        try:
+            stamp = self._file_stamp(path)
+        except OSError:
+            self._write_output(f"[error] File not found: {path}")
+            return
+        key = (path, stamp, op_name)
+        if key in self._op_cache:
+            self._op_cache.move_to_end(key)
+            done(self._op_cache[key])
+            return
+        # Reuse the text from the previous read while the file is unchanged.
+        cached = self._file_cache
+        text = cached[2] if cached is not None and cached[:2] == (path, stamp) else None
+
+        def work():
+            content = text
+            if content is None:
+                try:
+                    content = _read_input(path)
+                except OSError:
+                    return None, None
+            return content, func(content)
+
+        def finish(outcome):
+            content, result = outcome
+            if content is None:
+                self._write_output(f"[error] File not found: {path}")
+                return
+            self._file_cache = (path, stamp, content)
+            self._op_cache[key] = result
+            if len(self._op_cache) > self._OP_CACHE_SIZE:
+                self._op_cache.popitem(last=False)
+            done(result)
+
+        self._run_async(work, finish)
+
+    def _run_async(self, work, done):
+        """
+        Run work() on the worker thread and pass its result to done() on the
+        Tk thread once it is ready. The window stays responsive meanwhile.
+        work must not touch any widgets: Tk may only be used from its own thread.
+        """
+        future = self._executor.submit(work)
+
+        def poll():
+            if not future.done():
+                self.master.after(self._POLL_MS, poll)
+                return
+            done(future.result())
+
+        self.master.after(self._POLL_MS, poll)
+
+    def _request_network(self, done):
+        """
+        Call done(snet) with the SocialNetwork for the selected file.
+        Parsed networks are cached by path and file stamp, so running
+        several analyses on the same file parses it only once. A network that
+        isn't cached yet is built on the worker thread.
+        """
+        path = self.file_var.get().strip()
+        try:
+            key = (path, self._file_stamp(path))
+        except OSError:
+            self._write_output(f"[error] File not found: {path}")
+            return
+        snet = self._snet_cache.get(key)
+        if snet is not None:
+            self._snet_cache.move_to_end(key)
+            done(snet)
+            return
+
+        # An older network of the same file lets unchanged users be reused.
+        prev = next((cached for (cached_path, _), cached in reversed(self._snet_cache.items())
+                     if cached_path == path), None)
+
+        def build():
+            # Stream the file into the parser rather than reading it as text first.
+            snet = SocialNetwork()
+            try:
+                snet.update_from_path(path, prev)
+            except OSError:
+                return None
+            return snet
+
+        def finish(snet):
+            if snet is None:
+                self._write_output(f"[error] File not found: {path}")
+                return
+            self._snet_cache[key] = snet
+            if len(self._snet_cache) > self._SNET_CACHE_SIZE:
+                self._snet_cache.popitem(last=False)
+            done(snet)
+
+        self._run_async(build, finish)
 
     def _write_output(self, text):
-        self.output_area.delete('1.0', tk.END)
-        self.output_area.insert(tk.END, text)
+        # Replace the whole output with one delete and one insert. Undo is
+        # switched off meanwhile so a large insert isn't recorded as an edit,
+        # and Tk redraws once when it's idle again.
+        area = self.output_area
+        undo = area.cget('undo')
+        area.configure(undo=False)
+        area.delete('1.0', tk.END)
+        area.insert(tk.END, text)
+        area.configure(undo=undo)
+        area.mark_set('insert', '1.0')
+        area.edit_modified(False)  # set again by any later edit
+        self._last_compressed = None  # the output no longer shows that bundle
+        # Any stream still writing to the output is superseded.
+        self._stream_id += 1
+        self._stream_open = False
+
+    def _stream_output(self, produce):
+        """
+        Clear the output and run produce(emit) on the worker thread. Every
+        string passed to emit() is appended to the output area on the next
+        drain tick, so the first results show up before the job is done.
+        """
+        self._write_output("")
+        stream_id = self._stream_id
+        put = self._result_q.put
+
+        def work():
+            try:
+                produce(lambda chunk: put((stream_id, chunk)))
+            finally:
+                put((stream_id, None))
+
+        self._stream_open = True
+        self._executor.submit(work)
+        if not self._draining:
+            self._draining = True
+            self.master.after(self._DRAIN_MS, self._drain)
+
+    def _drain(self):
+        # Copy what is queued for the current stream (up to _DRAIN_MAX_CHARS)
+        # into the output area in one insert, and keep ticking until that
+        # stream has ended.
+        chunks = []
+        budget = self._DRAIN_MAX_CHARS
+        while budget > 0:
+            try:
+                stream_id, chunk = self._result_q.get_nowait()
+            except queue.Empty:
+                break
+            if stream_id != self._stream_id:
+                continue  # left over from an output that was replaced
+            if chunk is None:
+                self._stream_open = False
+                break
+            chunks.append(chunk)
+            budget -= len(chunk)
+        if chunks:
+            self.output_area.insert(tk.END, "".join(chunks))
+        if self._stream_open:
+            self.master.after(self._DRAIN_MS, self._drain)
+        else:
+            self._draining = False
 
     # GUI handlers:
 
     def gui_verify(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
-        ok, fixed, msg = verify_xml_structure(content, auto_fix=True)
-        to_display = msg
-        if ok and fixed != content:
-            to_display += "\n\n--- Fixed XML ---\n" + fixed
-        self._write_output(to_display)
+        def check(content):
+            ok, fixed, msg = verify_xml_structure(content, auto_fix=True)
+            if ok and fixed != content:
+                msg += "\n\n--- Fixed XML ---\n" + fixed
+            return msg
+
+        self._file_op('verify', check, self._write_output)
 
     def gui_format(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
-        formatted = format_xml(content)
-        self._write_output(formatted)
+        self._file_op('format', format_xml, self._write_output)
 
     def gui_json(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
-        jdata = xml_to_json(content)
-        if jdata is None:
-            self._write_output("Error converting XML to JSON (maybe malformed).")
-        else:
-            self._write_output(jdata)
+        def show(jdata):
+            if jdata is None:
+                self._write_output("Error converting XML to JSON (maybe malformed).")
+            else:
+                self._write_output(jdata)
+
+        self._file_op('json', xml_to_json, show)
 
     def gui_minify(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
-        mini_str = minify_xml(content)
-        self._write_output(mini_str)
+        self._file_op('minify', minify_xml, self._write_output)
 
     def gui_compress(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
+        def show(result):
+            comp, merges_map, bundle_json, digest = result
+            self._write_output(bundle_json)
+            self._last_compressed = (comp, merges_map, digest)
+
+        self._file_op('compress', self._compress_bundle, show)
+
+    @staticmethod
+    def _compress_bundle(content):
+        # Compress content and return (compressed, merges_map, bundle JSON,
+        # digest of the JSON).
         comp, merges_map = compress_data(content)
-        import json
         bundle = {
             'compressed': comp,
             'merges_map': merges_map
         }
-        self._write_output(json.dumps(bundle, indent=2))
+        bundle_json = _json_dumps(bundle, indent=True)
+        return comp, merges_map, bundle_json, _bundle_digest(bundle_json)
 
     def gui_decompress(self):
+        last = self._last_compressed
+        if last is not None and not self.output_area.edit_modified():
+            # The output shows the bundle from the last Compress, untouched:
+            # decompress that without copying the text back out of Tk.
+            self._write_output(decompress_data(last[0], last[1]))
+            return
         text = self.output_area.get('1.0', tk.END).strip()
         if not text:
             self._write_output("Output area is empty. Nothing to decompress.")
             return
-        import json
-        try:
-            bundle = json.loads(text)
-            comp_data = bundle['compressed']
-            merges_map = bundle['merges_map']
-            original = decompress_data(comp_data, merges_map)
-            self._write_output(original)
-        except:
-            self._write_output("Could not parse the compressed JSON.")
-
-    def gui_draw(self):
-        content = self._read_xml_file()
-        if content is None:
+        # If the text was edited but still matches that bundle (e.g. an edit
+        # that was undone), decompress it without parsing the JSON either.
+        if last is not None and last[2] == _bundle_digest(text):
+            self._write_output(decompress_data(last[0], last[1]))
             return
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
-        draw_network(snet)
 
-    def gui_most_active(self):
-        content = self._read_xml_file()
-        if content is None:
+        if not text.startswith('{'):
+            # A bundle is a JSON object; don't bother parsing anything else.
+            self._write_output("Could not parse the compressed JSON: "
+                               "the output doesn't hold a compressed bundle.")
             return
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
+
+        def work():
+            # Parsing a large bundle takes a while, so it runs on the worker.
+            try:
+                bundle = _json_loads(text)
+                comp_data = bundle['compressed']
+                merges_map = bundle['merges_map']
+                return decompress_data(comp_data, merges_map)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                # ValueError covers malformed JSON; the others a wrong shape.
+                return f"Could not parse the compressed JSON: {type(e).__name__}: {e}"
+
+        self._run_async(work, self._write_output)
+
+    @_with_network
+    def gui_draw(self, snet):
+        draw_network(snet)
+
+    @_with_network
+    def gui_most_active(self, snet):
         uid, uname, outdeg = snet.find_most_active()
         if uid:
             self._write_output(f"Most active user: ID={uid}, Name={uname}, Follows={outdeg}")
         else:
             self._write_output("No users found or no data present.")
 
-    def gui_most_influencer(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
+    @_with_network
+    def gui_most_influencer(self, snet):
         uid, uname, count = snet.find_most_influencer()
         if uid:
             self._write_output(f"Most influencer: ID={uid}, Name={uname}, Followers={count}")
         else:
             self._write_output("No users found or no data present.")
 
-    def gui_mutual(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
+    @_with_network
+    def gui_mutual(self, snet):
         ids_str = self.mutual_var.get().strip()
         if not ids_str:
             self._write_output("No user IDs provided for mutual followers check.")
             return
-        user_ids = [x.strip() for x in ids_str.split(',')]
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
+        user_ids = [u for u in _ID_SPLIT_RE.split(ids_str) if u]
         mutuals = snet.mutual_followers(user_ids)
         self._write_output(f"Mutual followers of {user_ids}: {mutuals}")
 
-    def gui_suggest(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
+    @_with_network
+    def gui_suggest(self, snet):
         uid = self.suggest_var.get().strip()
         if not uid:
             self._write_output("No user ID provided for suggestion.")
             return
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
         suggestions = snet.suggest_follows(uid)
         self._write_output(f"Suggestions for user {uid}: {suggestions}")
 
-    def gui_search_word(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
+    @_with_network
+    def gui_search_word(self, snet):
         word = self.word_var.get().strip()
         if not word:
             self._write_output("No word entered.")
             return
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
-        results = snet.search_posts_word(word)
-        if not results:
-            self._write_output("No posts found containing that word.")
-        else:
-            display_str = "Posts containing the word:\n"
-            for (uid, uname, body) in results:
-                display_str += f"User {uid} ({uname}): {body[:70]}...\n"
-            self._write_output(display_str)
-
-    def gui_search_topic(self):
-        content = self._read_xml_file()
-        if content is None:
-            return
+        self._stream_output(lambda emit: _emit_search_results(
+            emit, snet.iter_posts_word(word),
+            "Posts containing the word:\n", "No posts found containing that word."))
+
+    @_with_network
+    def gui_search_topic(self, snet):
         topic = self.topic_var.get().strip()
         if not topic:
             self._write_output("No topic entered.")
             return
-        snet = SocialNetwork()
-        snet.build_from_xml(content)
-        results = snet.search_posts_topic(topic)
-        if not results:
-            self._write_output("No posts found with that topic.")
-        else:
-            display_str = "Posts containing the topic:\n"
-            for (uid, uname, body) in results:
-                display_str += f"User {uid} ({uname}): {body[:70]}...\n"
-            self._write_output(display_str)
+        self._stream_output(lambda emit: _emit_search_results(
+            emit, snet.iter_posts_topic(topic),
+            "Posts containing the topic:\n", "No posts found with that topic."))
+
+    # Lines copied from the text widget per write in save_output.
+    _SAVE_CHUNK_LINES = 1024
 
     def save_output(self):
-        text = self.output_area.get('1.0', tk.END)
-        if not text.strip():
+        area = self.output_area
+        # Look for any non-blank character instead of fetching the whole text.
+        if not area.search(r'\S', '1.0', tk.END, regexp=True):
             messagebox.showinfo("Info", "Output area is empty.")
             return
         fname = filedialog.asksaveasfilename(title="Save output", defaultextension=".txt")
         if fname:
-            with open(fname, 'w', encoding='utf-8') as fw:
-                fw.write(text)
+            # Copy the widget to disk a block of lines at a time, so a large
+            # output never has to exist as one Python string.
+            step = self._SAVE_CHUNK_LINES
+            last_line = int(area.index('end-1c').split('.')[0])
+            # A 1 MiB buffer turns the blocks into a few large writes.
+            with open(fname, 'w', encoding='utf-8', buffering=1 << 20) as fw:
+                fw.writelines(area.get(f'{line}.0', f'{line + step}.0')
+                              for line in range(1, last_line + 1, step))
             messagebox.showinfo("Saved", f"Output saved to {fname}")
 
 
@@ -961,10 +1746,21 @@ def gui_main():
 ###############################################################################
 # Main Entry
 ###############################################################################
-if __name__ == "__main__":
+def main(argv=None):
+    """
+    Run the CLI when arguments are given, otherwise launch the GUI.
+    Returns the exit status.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
     # If a command is given, we assume CLI mode
-    if len(sys.argv) > 1:
-        cli_main()
+    if argv:
+        cli_main(argv)
     else:
         # Otherwise, launch the GUI
         gui_main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())